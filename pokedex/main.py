@@ -1,13 +1,26 @@
 import pip
 import sys
 import os
+import time
+import hashlib
+import zlib
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+# Bloqueio de arquivos entre processos (fcntl no Linux/macOS, msvcrt no Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
 try:
     # Tentar importar os módulos necessários
     import customtkinter as ctk
     import requests
-    from tkinter import Tk, PhotoImage, messagebox
+    from tkinter import Tk, PhotoImage, Entry, messagebox
     from PIL import ImageTk, Image
     from urllib.request import urlopen
     import pickle
@@ -29,6 +42,114 @@ CONFIG_FILE = "pokedex_config.json"  # Arquivo de configurações
 ICON_FILE = "icon_pk.ico"  # Ícone do aplicativo
 TITLE_IMAGE = "title.png"  # Imagem do título
 PK_BALL_IMAGE = "pk_ball.png"  # Imagem da pokébola
+MAX_TEAM_SIZE = 6  # Número máximo de pokémons na equipe
+API_URL = "https://pokeapi.co/api/v2"  # Endereço base da PokeAPI
+ARCHIVE_DIR = "pk_archive"  # Respostas originais da API, compactadas
+ARCHIVE_INDEX = os.path.join(ARCHIVE_DIR, "index.json")  # URL -> hash do conteúdo
+RENDER_DELAY_MS = 80  # Pausa na navegação antes de renderizar o pokémon completo
+IMAGE_POLL_MS = 50  # Intervalo de verificação das imagens baixadas em segundo plano
+IMAGE_TIMEOUT = 10  # Tempo máximo (s) de download de uma imagem
+CONFIG_SAVE_DELAY_MS = 1000  # Agrupa os salvamentos do histórico durante a navegação
+REPLACE_RETRIES = 20  # Tentativas de substituir um arquivo aberto por outro processo (Windows)
+BACKGROUND_POLL_MS = 200  # Intervalo de verificação das tarefas em segundo plano
+JUMP_SIZE = 10  # Quantidade de pokémons pulados com Shift/PageUp/PageDown
+
+# Ordem dos tipos (a posição define o bit usado nas máscaras de tipo)
+TYPE_ORDER = [
+    "normal", "fire", "water", "electric", "grass", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy"
+]
+
+# Tabela de efetividade: tipo atacante -> {tipo defensor: multiplicador}
+# (apenas os valores diferentes de 1 são listados)
+TYPE_CHART = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 2, "bug": 2, "rock": 0.5, "dragon": 0.5, "steel": 2},
+    "water": {"fire": 2, "water": 0.5, "grass": 0.5, "ground": 2, "rock": 2, "dragon": 0.5},
+    "electric": {"water": 2, "electric": 0.5, "grass": 0.5, "ground": 0, "flying": 2, "dragon": 0.5},
+    "grass": {"fire": 0.5, "water": 2, "grass": 0.5, "poison": 0.5, "ground": 2, "flying": 0.5, "bug": 0.5, "rock": 2, "dragon": 0.5, "steel": 0.5},
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 0.5, "ground": 2, "flying": 2, "dragon": 2, "steel": 0.5},
+    "fighting": {"normal": 2, "ice": 2, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5, "rock": 2, "ghost": 0, "dark": 2, "steel": 2, "fairy": 0.5},
+    "poison": {"grass": 2, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0, "fairy": 2},
+    "ground": {"fire": 2, "electric": 2, "grass": 0.5, "poison": 2, "flying": 0, "bug": 0.5, "rock": 2, "steel": 2},
+    "flying": {"electric": 0.5, "grass": 2, "fighting": 2, "bug": 2, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fighting": 2, "poison": 2, "psychic": 0.5, "dark": 0, "steel": 0.5},
+    "bug": {"fire": 0.5, "grass": 2, "fighting": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2, "ghost": 0.5, "dark": 2, "steel": 0.5, "fairy": 0.5},
+    "rock": {"fire": 2, "ice": 2, "fighting": 0.5, "ground": 0.5, "flying": 2, "bug": 2, "steel": 0.5},
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
+    "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
+    "dark": {"fighting": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2, "rock": 2, "steel": 0.5, "fairy": 2},
+    "fairy": {"fire": 0.5, "fighting": 2, "poison": 0.5, "dragon": 2, "dark": 2, "steel": 0.5}
+}
+
+@contextmanager
+def file_lock(path):
+    """Bloqueio consultivo exclusivo entre processos usando um arquivo .lock"""
+    with open(path + ".lock", "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK desiste após 10 segundos; continua aguardando
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+# Máscara de permissões do processo (lida uma vez; os.umask só pode ser consultado alterando-a)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def atomic_write(path, data):
+    """Grava os bytes em um arquivo temporário e o renomeia sobre o destino"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # mkstemp cria o arquivo só para o dono; mantém as permissões do arquivo original
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(temp_path, mode)
+        
+        # Leitores veem o arquivo antigo ou o novo, nunca um arquivo pela metade.
+        # No Windows a substituição falha enquanto outro processo lê o destino
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(temp_path, path)
+                break
+            except PermissionError:
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(0.05)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def count_bits(mask):
+    """Conta quantos tipos estão presentes em uma máscara de bits"""
+    return bin(mask).count("1")
+
+def mask_to_types(mask):
+    """Converte uma máscara de bits na lista de nomes de tipos"""
+    return [type_name.title() for i, type_name in enumerate(TYPE_ORDER) if mask >> i & 1]
 
 class PokedexApp:
     def __init__(self):
@@ -36,7 +157,21 @@ class PokedexApp:
         self.main_w = ctk.CTk()  # Janela principal
         self.pk_db = None  # Dados dos pokémons
         self.current_pokemon = 1  # Pokémon atualmente exibido
+        self.pending_pokemon = 1  # Último pokémon solicitado pela navegação
+        self.render_job = None  # Renderização agendada (after) ainda não executada
+        self.image_cache = {}  # Imagens prontas para exibição
+        self.image_results = {}  # Imagens baixadas em segundo plano (None = falha)
+        self.image_loading = set()  # Pokémons com download de imagem em andamento
+        self.image_poll_job = None  # Verificação (after) da imagem em exibição
         self.favorites = set()  # Conjunto de favoritos
+        self.saved_config = {}  # Última configuração lida ou gravada no arquivo
+        self.config_save_job = None  # Salvamento (after) do histórico ainda não executado
+        self.team = []  # Equipe atual (até MAX_TEAM_SIZE pokémons)
+        self.team_index = {}  # Máscaras de tipo e total de atributos por pokémon
+        self.evolution_families = {}  # Cadeia de evolução -> membros da família
+        self.evolution_children = {}  # Pokémon -> evoluções diretas
+        self.archive_index = {}  # Respostas arquivadas (URL -> hash do conteúdo)
+        self.background_busy = False  # Há uma tarefa de dados em segundo plano
         self.theme = "dark"  # Tema padrão
         self.color_theme = "dark-blue"  # Tema de cores padrão
         self.history = []  # Histórico de Pokémon visualizados
@@ -44,50 +179,114 @@ class PokedexApp:
         self.load_config()  # Carrega as configurações
         self.setup_window()  # Configura a janela
         self.load_data()  # Carrega os dados dos pokémons
+        self.build_evolution_index()  # Monta o grafo de evoluções
+        self.build_team_index()  # Pré-calcula os dados usados pela equipe
         self.setup_main_screen()  # Configura a tela principal
+        self.enrich_in_background()  # Completa caches antigos sem travar a janela
         self.main_w.mainloop()  # Inicia o loop principal
 
     def load_config(self):
         """Carrega as configurações do arquivo ou define padrões"""
+        try:
+            # Tenta carregar o arquivo de configuração
+            with open(CONFIG_FILE, "r") as f:
+                config = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Se houver erro, usa as configurações padrão
+            config = {}
+        
+        self.apply_config(config)
+        self.saved_config = self.current_config()  # Estado conhecido do arquivo
+
+    def apply_config(self, config):
+        """Aplica um dicionário de configurações, usando padrões para chaves ausentes"""
         # Configurações padrão
         defaults = {
             "window_size": [800, 800],
             "theme": "dark",
             "color_theme": "dark-blue",
             "favorites": [],
+            "team": [],
             "history": []
         }
         
-        try:
-            # Tenta carregar o arquivo de configuração
-            with open(CONFIG_FILE, "r") as f:
-                config = json.load(f)
-                self.window_size = config.get("window_size", defaults["window_size"])
-                self.theme = config.get("theme", defaults["theme"])
-                self.color_theme = config.get("color_theme", defaults["color_theme"])
-                self.favorites = set(config.get("favorites", defaults["favorites"]))
-                self.history = config.get("history", defaults["history"])
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Se houver erro, usa as configurações padrão
-            self.window_size = defaults["window_size"]
-            self.theme = defaults["theme"]
-            self.color_theme = defaults["color_theme"]
-            self.favorites = set(defaults["favorites"])
-            self.history = defaults["history"]
+        self.window_size = config.get("window_size", defaults["window_size"])
+        self.theme = config.get("theme", defaults["theme"])
+        self.color_theme = config.get("color_theme", defaults["color_theme"])
+        self.favorites = set(config.get("favorites", defaults["favorites"]))
+        self.team = list(config.get("team", defaults["team"]))[:MAX_TEAM_SIZE]
+        self.history = list(config.get("history", defaults["history"]))
 
-    def save_config(self):
-        """Salva a configuração atual no arquivo"""
-        config = {
-            "window_size": self.window_size,
+    def current_config(self):
+        """Retorna a configuração atual deste processo"""
+        return {
+            "window_size": list(self.window_size),
             "theme": self.theme,
             "color_theme": self.color_theme,
-            "favorites": list(self.favorites),
+            "favorites": sorted(self.favorites),
+            "team": list(self.team),
             "history": self.history[-self.max_history:]  # Salva apenas os últimos itens
         }
+
+    def merge_config(self, disk_config, config):
+        """Mescla no arquivo apenas o que este processo alterou desde o último salvamento"""
+        base = self.saved_config
+        merged = {}
+        
+        # Demais chaves: vale o valor do último processo que as alterou
+        for key, value in config.items():
+            if value != base.get(key) or key not in disk_config:
+                merged[key] = value
+            else:
+                merged[key] = disk_config[key]
+        
+        # Favoritos e equipe: aplica só as adições e remoções feitas aqui
+        added = set(config["favorites"]) - set(base["favorites"])
+        removed = set(base["favorites"]) - set(config["favorites"])
+        merged["favorites"] = sorted((set(disk_config.get("favorites", [])) - removed) | added)
+        
+        removed = set(base["team"]) - set(config["team"])
+        team = [pokemon_id for pokemon_id in disk_config.get("team", []) if pokemon_id not in removed]
+        team += [pokemon_id for pokemon_id in config["team"] if pokemon_id not in base["team"] and pokemon_id not in team]
+        merged["team"] = team[:MAX_TEAM_SIZE]
+        
+        return merged
+
+    def schedule_save_config(self):
+        """Agenda o salvamento da configuração, agrupando alterações próximas"""
+        if self.config_save_job is not None:
+            self.main_w.after_cancel(self.config_save_job)
+        self.config_save_job = self.main_w.after(CONFIG_SAVE_DELAY_MS, self.flush_config_save)
+
+    def flush_config_save(self):
+        """Executa o salvamento agendado da configuração"""
+        self.config_save_job = None
+        self.save_config()
+
+    def save_config(self):
+        """Salva a configuração atual no arquivo, preservando alterações de outros processos"""
+        # Este salvamento já inclui o histórico agendado
+        if self.config_save_job is not None:
+            self.main_w.after_cancel(self.config_save_job)
+            self.config_save_job = None
+        
+        config = self.current_config()
         
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config, f, indent=4)
+            with file_lock(CONFIG_FILE):
+                # Relê o arquivo: outra instância pode tê-lo alterado
+                try:
+                    with open(CONFIG_FILE, "r") as f:
+                        disk_config = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    disk_config = {}
+                
+                config = self.merge_config(disk_config, config)
+                atomic_write(CONFIG_FILE, json.dumps(config, indent=4).encode("utf-8"))
+            
+            # Adota as alterações feitas por outras instâncias
+            self.apply_config(config)
+            self.saved_config = config
         except Exception as e:
             print(f"Erro ao salvar configuração: {e}")
 
@@ -109,71 +308,470 @@ class PokedexApp:
         # Define tamanhos mínimo e máximo da janela
         self.main_w.minsize(600, 600)
         self.main_w.maxsize(1200, 900)
+        
+        # Salva alterações pendentes ao fechar
+        self.main_w.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Salva o histórico pendente e fecha o aplicativo"""
+        if self.config_save_job is not None:
+            self.main_w.after_cancel(self.config_save_job)
+            self.flush_config_save()
+        self.main_w.destroy()
 
     def load_data(self):
         """Carrega os dados dos pokémons da API ou do cache"""
+        self.load_archive_index()
+        
+        # O cache é gravado com renomeação atômica, então a leitura dispensa bloqueio
+        self.pk_db = self.read_data()
+        if self.pk_db is not None:
+            return
+        
+        # Apenas um processo baixa os dados; os demais aguardam e usam o cache pronto
+        with file_lock(DATA_FILE):
+            self.pk_db = self.read_data()
+            if self.pk_db is None:
+                try:
+                    self.pk_db = self.fetch_pokemon_data()  # Se falhar, busca da API
+                except requests.RequestException as e:
+                    messagebox.showerror("Erro na API", f"Falha ao buscar dados da PokeAPI: {e}")
+                    sys.exit(1)
+
+    def read_data(self):
+        """Lê os dados dos pokémons do arquivo de cache"""
         try:
-            # Tenta carregar do arquivo de cache
             with open(DATA_FILE, "rb") as file:
-                self.pk_db = pickle.load(file)
+                pk_db = pickle.load(file)
                 print("Dados dos pokémons carregados do cache")
+                return pk_db
         except Exception as e:
             print(f"Cache não encontrado ou erro ao carregar: {e}")
-            self.fetch_pokemon_data()  # Se falhar, busca da API
+            return None
+
+    def save_data(self, pk_db=None):
+        """Salva os dados dos pokémons no cache (o chamador deve manter o bloqueio)"""
+        pk_db = self.pk_db if pk_db is None else pk_db
+        try:
+            atomic_write(DATA_FILE, pickle.dumps(pk_db))
+        except OSError as e:
+            # Os dados continuam válidos em memória; o cache é salvo na próxima vez
+            print(f"Erro ao salvar cache: {e}")
+
+    def load_archive_index(self):
+        """Carrega o índice das respostas arquivadas"""
+        try:
+            with open(ARCHIVE_INDEX, "r") as f:
+                self.archive_index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.archive_index = {}
+
+    def save_archive_index(self):
+        """Salva o índice do arquivo, mesclando entradas gravadas por outros processos"""
+        try:
+            os.makedirs(ARCHIVE_DIR, exist_ok=True)
+            with file_lock(ARCHIVE_INDEX):
+                try:
+                    with open(ARCHIVE_INDEX, "r") as f:
+                        index = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    index = {}
+                index.update(self.archive_index)
+                atomic_write(ARCHIVE_INDEX, json.dumps(index, indent=1, sort_keys=True).encode("utf-8"))
+                self.archive_index = index
+        except OSError as e:
+            print(f"Erro ao salvar índice do arquivo: {e}")
+
+    def get_json(self, session, url, offline=False, refresh=False):
+        """Retorna o documento da URL a partir do arquivo ou, se ausente (ou refresh), da PokeAPI"""
+        content_hash = None if refresh else self.archive_index.get(url)
+        if content_hash:
+            try:
+                with open(os.path.join(ARCHIVE_DIR, content_hash), "rb") as f:
+                    return json.loads(zlib.decompress(f.read()))
+            except (OSError, zlib.error, ValueError) as e:
+                print(f"Documento arquivado inválido para {url}: {e}")
+        
+        if offline:
+            raise FileNotFoundError(f"Documento não arquivado: {url}")
+        
+        response = session.get(url)
+        response.raise_for_status()  # Não arquiva páginas de erro
+        data = response.json()
+        
+        # Documentos idênticos compartilham o mesmo arquivo (endereçado pelo conteúdo)
+        raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        content_hash = hashlib.sha256(raw).hexdigest()
+        object_path = os.path.join(ARCHIVE_DIR, content_hash)
+        try:
+            if not os.path.exists(object_path):
+                os.makedirs(ARCHIVE_DIR, exist_ok=True)
+                atomic_write(object_path, zlib.compress(raw, 9))
+            self.archive_index[url] = content_hash
+        except OSError as e:
+            # Falha ao arquivar não impede o uso do documento baixado
+            print(f"Erro ao arquivar {url}: {e}")
+        
+        # Pequeno delay para não sobrecarregar a API
+        time.sleep(0.05)
+        return data
+
+    def rebuild_from_archive(self):
+        """Reconstrói os dados dos pokémons a partir do arquivo, sem acessar a rede"""
+        self.reload_pokemon_data(
+            "Dados Reprocessados",
+            "Os dados foram reconstruídos a partir das respostas arquivadas.",
+            offline=True
+        )
+
+    def refresh_from_api(self):
+        """Baixa novamente todos os documentos da PokeAPI e reconstrói os dados"""
+        # Documentos que não mudaram continuam no mesmo arquivo (mesmo hash)
+        self.reload_pokemon_data(
+            "Dados Atualizados",
+            "Os dados foram atualizados a partir da PokeAPI.",
+            refresh=True
+        )
 
-    def fetch_pokemon_data(self):
-        """Busca dados dos pokémons da PokeAPI"""
+    def reload_pokemon_data(self, title, message, offline=False, refresh=False):
+        """Refaz os dados dos pokémons em segundo plano, mantendo os atuais em caso de erro"""
+        if self.background_busy:
+            messagebox.showinfo("Aguarde", "Os dados já estão sendo atualizados.")
+            return
+        
+        def work():
+            with file_lock(DATA_FILE):
+                self.load_archive_index()
+                return self.fetch_pokemon_data(offline=offline, refresh=refresh)
+        
+        def on_done(pk_db, error):
+            self.main_w.title(f"Pokedex App v{APP_VERSION}")
+            if error is not None:
+                # Os dados atuais não foram alterados
+                messagebox.showerror("Erro", f"Não foi possível atualizar os dados: {error}")
+                return
+            self.pk_db = pk_db
+            self.image_cache.clear()  # As imagens podem ter mudado
+            self.build_evolution_index()
+            self.build_team_index()
+            messagebox.showinfo(title, message)
+        
+        self.main_w.title(f"Pokedex App v{APP_VERSION} - Atualizando dados...")
+        self.run_in_background(work, on_done)
+
+    def needs_enrichment(self, pk_db=None):
+        """Verifica se o cache é antigo e não possui os dados de espécie e evolução"""
+        pk_db = self.pk_db if pk_db is None else pk_db
+        return any("evolution_chain" not in pokemon for pokemon in pk_db.values())
+
+    def fetch_pokemon_data(self, offline=False, refresh=False):
+        """Busca dados dos pokémons da PokeAPI (apenas do arquivo se offline; ignorando-o se refresh)"""
+        # Monta um novo dicionário e o retorna, sem alterar os dados em uso pela interface
         print("Buscando dados da PokeAPI...")
+        session = requests.Session()  # Reaproveita a conexão entre as requisições
         try:
             # Obtém a lista de pokémons
-            api_response = requests.get("https://pokeapi.co/api/v2/pokedex/2/")
-            api_response.raise_for_status()  # Verifica erros
-            dex_data = api_response.json()
+            dex_data = self.get_json(session, f"{API_URL}/pokedex/2/", offline, refresh)
             
             # Cria dicionário de pokémons
-            self.pk_db = {}
+            pk_db = {}
             for entry in dex_data["pokemon_entries"]:
                 pokemon_id = entry["entry_number"]
                 name = entry["pokemon_species"]["name"].title()
-                self.pk_db[pokemon_id] = {"name": name}
+                pk_db[pokemon_id] = {"name": name}
             
             # Obtém detalhes adicionais para cada pokémon
-            for pokemon_id in self.pk_db:
+            for pokemon_id in pk_db:
                 # Dados da espécie (para taxa de captura)
-                species_url = f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}/"
-                species_data = requests.get(species_url).json()
-                self.pk_db[pokemon_id]["catch_rate"] = species_data.get("capture_rate", 0)
+                species_url = f"{API_URL}/pokemon-species/{pokemon_id}/"
+                species_data = self.get_json(session, species_url, offline, refresh)
+                pk_db[pokemon_id]["catch_rate"] = species_data.get("capture_rate", 0)
+                self.store_species_details(pokemon_id, species_data, pk_db)
                 
                 # Dados do pokémon (para sprites e tipos)
-                pokemon_url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}/"
-                pokemon_data = requests.get(pokemon_url).json()
+                pokemon_url = f"{API_URL}/pokemon/{pokemon_id}/"
+                pokemon_data = self.get_json(session, pokemon_url, offline, refresh)
                 
                 # Armazena URL do sprite
-                self.pk_db[pokemon_id]["sprite"] = pokemon_data["sprites"]["other"]["official-artwork"]["front_default"]
+                pk_db[pokemon_id]["sprite"] = pokemon_data["sprites"]["other"]["official-artwork"]["front_default"]
                 
                 # Armazena tipos
-                self.pk_db[pokemon_id]["types"] = [t["type"]["name"].title() for t in pokemon_data["types"]]
+                pk_db[pokemon_id]["types"] = [t["type"]["name"].title() for t in pokemon_data["types"]]
                 
                 # Armazena estatísticas
-                self.pk_db[pokemon_id]["stats"] = {s["stat"]["name"].title(): s["base_stat"] for s in pokemon_data["stats"]}
+                pk_db[pokemon_id]["stats"] = {s["stat"]["name"].title(): s["base_stat"] for s in pokemon_data["stats"]}
                 
                 # Armazena altura e peso
-                self.pk_db[pokemon_id]["height"] = pokemon_data["height"] / 10  # Converte para metros
-                self.pk_db[pokemon_id]["weight"] = pokemon_data["weight"] / 10  # Converte para kg
-                
-                print(f"Dados obtidos para {self.pk_db[pokemon_id]['name']} (#{pokemon_id})")
+                pk_db[pokemon_id]["height"] = pokemon_data["height"] / 10  # Converte para metros
+                pk_db[pokemon_id]["weight"] = pokemon_data["weight"] / 10  # Converte para kg
                 
-                # Pequeno delay para não sobrecarregar a API
-                import time
-                time.sleep(0.1)
+                print(f"Dados obtidos para {pk_db[pokemon_id]['name']} (#{pokemon_id})")
+            
+            # Cadeias de evolução (uma requisição por cadeia)
+            self.fetch_evolution_chains(session, offline, refresh, pk_db)
             
             # Salva os dados no arquivo
-            with open(DATA_FILE, "wb") as file:
-                pickle.dump(self.pk_db, file)
+            self.save_data(pk_db)
+            return pk_db
+        finally:
+            # Mantém as respostas já baixadas mesmo se a busca for interrompida
+            self.save_archive_index()
+
+    def store_species_details(self, pokemon_id, species_data, pk_db=None):
+        """Armazena descrição, geração, habitat e cadeia de evolução da espécie"""
+        # Descrição em português quando disponível, senão em inglês
+        flavor_texts = {}
+        for entry in species_data.get("flavor_text_entries", []):
+            flavor_texts.setdefault(entry["language"]["name"], entry["flavor_text"])
+        flavor_text = flavor_texts.get("pt-BR") or flavor_texts.get("pt") or flavor_texts.get("en", "")
+        
+        habitat = species_data.get("habitat")
+        generation = species_data.get("generation")
+        chain = species_data.get("evolution_chain")
+        
+        pk_db = self.pk_db if pk_db is None else pk_db
+        pokemon = pk_db[pokemon_id]
+        pokemon["flavor_text"] = " ".join(flavor_text.split())  # Remove quebras de linha da API
+        pokemon["generation"] = generation["name"].split("-")[-1].upper() if generation else ""
+        pokemon["habitat"] = habitat["name"].title() if habitat else ""
+        pokemon["evolution_chain_url"] = chain["url"] if chain else None
+
+    def fetch_evolution_chains(self, session, offline=False, refresh=False, pk_db=None):
+        """Busca cada cadeia de evolução uma única vez e registra as ligações"""
+        pk_db = self.pk_db if pk_db is None else pk_db
+        
+        # Vários pokémons compartilham a mesma cadeia
+        chain_urls = {pokemon.get("evolution_chain_url") for pokemon in pk_db.values()}
+        chain_urls.discard(None)
+        
+        for chain_url in sorted(chain_urls):
+            chain_data = self.get_json(session, chain_url, offline, refresh)
+            chain_id = chain_data["id"]
+            
+            # Percorre a árvore de evolução registrando de quem cada espécie evolui
+            pending = [(chain_data["chain"], None)]
+            while pending:
+                node, parent_id = pending.pop()
+                species_id = int(node["species"]["url"].rstrip("/").split("/")[-1])
+                
+                # Ignora espécies que não estão nesta pokédex
+                if species_id in pk_db:
+                    pk_db[species_id]["evolution_chain"] = chain_id
+                    pk_db[species_id]["evolves_from"] = parent_id
+                    parent_id = species_id
                 
+                for child in node["evolves_to"]:
+                    pending.append((child, parent_id))
+            
+            print(f"Cadeia de evolução #{chain_id} obtida")
+        
+        # Pokémons sem cadeia recebem uma família própria
+        for pokemon_id, pokemon in pk_db.items():
+            pokemon.setdefault("evolution_chain", -pokemon_id)
+            pokemon.setdefault("evolves_from", None)
+
+    def run_in_background(self, work, on_done):
+        """Executa work fora da thread da interface e chama on_done(resultado, erro) nela"""
+        outcome = {}
+        
+        def target():
+            try:
+                outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = e
+        
+        def poll():
+            if not outcome:
+                self.main_w.after(BACKGROUND_POLL_MS, poll)
+                return
+            self.background_busy = False
+            on_done(outcome.get("result"), outcome.get("error"))
+        
+        self.background_busy = True
+        threading.Thread(target=target, daemon=True).start()
+        self.main_w.after(BACKGROUND_POLL_MS, poll)
+
+    def enrich_in_background(self):
+        """Busca os dados de espécie e evolução depois que a janela já está aberta"""
+        if self.needs_enrichment() and not self.background_busy:
+            self.run_in_background(self.enrich_pokemon_data, self.finish_enrichment)
+
+    def finish_enrichment(self, result, error):
+        """Atualiza o grafo de evoluções quando o enriquecimento termina"""
+        if error is not None:
+            print(f"Erro ao buscar dados de evolução: {error}")
+        self.build_evolution_index()
+        
+        # Atualiza a família de evolução do pokémon em exibição
+        if hasattr(self, 'pokedex_frame') and self.pokedex_frame.winfo_ismapped() and self.render_job is None:
+            self.show_pokemon(self.current_pokemon)
+
+    def enrich_pokemon_data(self):
+        """Completa um cache antigo com dados de espécie e cadeias de evolução"""
+        print("Buscando dados de espécie e evolução...")
+        session = requests.Session()  # Reaproveita a conexão entre as requisições
+        try:
+            with file_lock(DATA_FILE):
+                # Outro processo pode já ter completado o cache enquanto aguardávamos
+                disk_db = self.read_data()
+                if disk_db is not None and not self.needs_enrichment(disk_db):
+                    for pokemon_id, pokemon in disk_db.items():
+                        if pokemon_id in self.pk_db:
+                            self.pk_db[pokemon_id].update(pokemon)
+                    return
+                
+                # Respostas já arquivadas em tentativas anteriores não são baixadas de novo
+                for pokemon_id, pokemon in self.pk_db.items():
+                    if "evolution_chain_url" not in pokemon:
+                        species_url = f"{API_URL}/pokemon-species/{pokemon_id}/"
+                        self.store_species_details(pokemon_id, self.get_json(session, species_url))
+                
+                self.fetch_evolution_chains(session)
+                
+                # Salva os dados no arquivo
+                self.save_data()
         except requests.RequestException as e:
-            messagebox.showerror("Erro na API", f"Falha ao buscar dados da PokeAPI: {e}")
-            sys.exit(1)
+            # Os dados básicos continuam utilizáveis sem as evoluções
+            print(f"Erro ao buscar dados de evolução: {e}")
+        except (KeyError, ValueError) as e:
+            # Resposta inesperada da API (documento incompleto ou JSON inválido)
+            print(f"Resposta inválida ao buscar dados de evolução: {e}")
+        finally:
+            self.save_archive_index()
+
+    def build_evolution_index(self):
+        """Monta o grafo de evoluções em memória para consultas em tempo constante"""
+        self.evolution_families = {}
+        self.evolution_children = {pokemon_id: [] for pokemon_id in self.pk_db}
+        
+        for pokemon_id in sorted(self.pk_db.keys()):
+            pokemon = self.pk_db[pokemon_id]
+            chain_id = pokemon.get("evolution_chain", -pokemon_id)
+            self.evolution_families.setdefault(chain_id, []).append(pokemon_id)
+            
+            parent_id = pokemon.get("evolves_from")
+            if parent_id in self.evolution_children:
+                self.evolution_children[parent_id].append(pokemon_id)
+
+    def get_evolution_family(self, pokemon_id):
+        """Retorna todos os membros da família de evolução do pokémon"""
+        chain_id = self.pk_db[pokemon_id].get("evolution_chain", -pokemon_id)
+        return self.evolution_families.get(chain_id, [pokemon_id])
+
+    def get_evolution_stages(self, pokemon_id):
+        """Retorna os estágios de evolução da família, do primeiro ao último"""
+        # Sobe até a forma inicial da família
+        root_id = pokemon_id
+        while self.pk_db[root_id].get("evolves_from") in self.pk_db:
+            root_id = self.pk_db[root_id]["evolves_from"]
+        
+        # Desce estágio por estágio pelas evoluções diretas
+        stages = []
+        stage = [root_id]
+        while stage:
+            stages.append(stage)
+            stage = [child_id for member_id in stage for child_id in self.evolution_children.get(member_id, [])]
+        return stages
+
+    def build_team_index(self):
+        """Pré-calcula as máscaras de tipo e o total de atributos de cada pokémon"""
+        # Máscara de fraquezas e resistências para cada tipo defensor isolado
+        type_bits = {type_name: 1 << i for i, type_name in enumerate(TYPE_ORDER)}
+
+        self.team_index = {}
+        for pokemon_id, pokemon in self.pk_db.items():
+            types = [t.lower() for t in pokemon["types"]]
+
+            # Tipos atingidos de forma super efetiva pelos ataques do próprio tipo (STAB)
+            offense = 0
+            for type_name in types:
+                for target, multiplier in TYPE_CHART.get(type_name, {}).items():
+                    if multiplier > 1:
+                        offense |= type_bits[target]
+
+            # Multiplicador defensivo combinado contra cada tipo atacante
+            weak = 0
+            resist = 0
+            for attacker in TYPE_ORDER:
+                multiplier = 1
+                for type_name in types:
+                    multiplier *= TYPE_CHART[attacker].get(type_name, 1)
+                if multiplier > 1:
+                    weak |= type_bits[attacker]
+                elif multiplier < 1:
+                    resist |= type_bits[attacker]
+
+            self.team_index[pokemon_id] = {
+                "offense": offense,
+                "weak": weak,
+                "resist": resist,
+                "total": sum(pokemon["stats"].values())
+            }
+
+        # Remove da equipe pokémons que não existem mais nos dados
+        self.team = [pokemon_id for pokemon_id in self.team if pokemon_id in self.pk_db]
+
+    def analyze_team(self, team=None):
+        """Calcula cobertura de tipos, fraquezas em comum e totais de atributos da equipe"""
+        team = self.team if team is None else team
+
+        coverage = 0
+        weak_once = 0  # Tipos que atingem ao menos um membro
+        weak_shared = 0  # Tipos que atingem dois ou mais membros
+        resisted = 0  # Tipos resistidos por ao menos um membro
+        stat_totals = {}
+
+        for pokemon_id in team:
+            entry = self.team_index[pokemon_id]
+            coverage |= entry["offense"]
+            weak_shared |= weak_once & entry["weak"]
+            weak_once |= entry["weak"]
+            resisted |= entry["resist"]
+            for stat, value in self.pk_db[pokemon_id]["stats"].items():
+                stat_totals[stat] = stat_totals.get(stat, 0) + value
+
+        return {
+            "coverage": coverage,
+            "weak_once": weak_once,
+            "weak_shared": weak_shared,
+            # Fraquezas que nenhum outro membro cobre com resistência
+            "uncovered": weak_once & ~resisted,
+            "stat_totals": stat_totals,
+            "total": sum(stat_totals.values())
+        }
+
+    def suggest_team_member(self, team=None):
+        """Sugere o pokémon que mais melhora a equipe atual"""
+        team = self.team if team is None else team
+        if len(team) >= MAX_TEAM_SIZE:
+            return None
+
+        analysis = self.analyze_team(team)
+        coverage = analysis["coverage"]
+        weak_shared = analysis["weak_shared"]
+        uncovered = analysis["uncovered"]
+        members = set(team)
+
+        best_id = None
+        best_score = None
+        for pokemon_id, entry in self.team_index.items():
+            if pokemon_id in members:
+                continue
+
+            # Pontuação feita apenas com operações de bits sobre as máscaras pré-calculadas
+            score = (
+                3 * count_bits(entry["offense"] & ~coverage)  # Nova cobertura
+                + 2 * count_bits(entry["resist"] & uncovered)  # Cobre fraquezas da equipe
+                - 3 * count_bits(entry["weak"] & uncovered)  # Cria ou agrava fraquezas em comum
+                - 2 * count_bits(entry["weak"] & weak_shared)  # Fraqueza já compartilhada por dois ou mais
+                - count_bits(entry["weak"])  # Fraquezas próprias (decide com a equipe vazia)
+                + entry["total"] / 100  # Desempate pelo total de atributos
+            )
+            if best_score is None or score > best_score:
+                best_id = pokemon_id
+                best_score = score
+
+        return best_id
 
     def setup_main_screen(self):
         """Cria a tela inicial/principal"""
@@ -227,7 +825,7 @@ class PokedexApp:
         """Mostra o diálogo de configurações"""
         settings = ctk.CTkToplevel(self.main_w)
         settings.title("Configurações")
-        settings.geometry("400x400")
+        settings.geometry("400x500")
         settings.resizable(False, False)
         settings.transient(self.main_w)  # Diálogo modal
         settings.grab_set()
@@ -271,6 +869,20 @@ class PokedexApp:
             command=lambda: self.set_history_size(history_var.get())
         ).pack(pady=5)
         
+        # Botão para reconstruir os dados a partir das respostas arquivadas
+        ctk.CTkButton(
+            settings,
+            text="Reprocessar Dados",
+            command=self.rebuild_from_archive
+        ).pack(pady=(20, 0))
+        
+        # Botão para baixar os dados novamente da PokeAPI
+        ctk.CTkButton(
+            settings,
+            text="Atualizar da API",
+            command=self.refresh_from_api
+        ).pack(pady=(10, 0))
+        
         # Botão para limpar cache
         ctk.CTkButton(
             settings,
@@ -314,8 +926,9 @@ class PokedexApp:
     def clear_cache(self):
         """Limpa os dados em cache dos pokémons"""
         try:
-            os.remove(DATA_FILE)
-            messagebox.showinfo("Cache Limpo", "Os dados em cache foram apagados. Serão baixados novamente ao reiniciar o aplicativo.")
+            with file_lock(DATA_FILE):
+                os.remove(DATA_FILE)
+            messagebox.showinfo("Cache Limpo", "Os dados em cache foram apagados. Serão reconstruídos a partir das respostas arquivadas (ou baixados novamente) ao reiniciar o aplicativo.")
         except Exception as e:
             messagebox.showerror("Erro", f"Não foi possível limpar o cache: {e}")
 
@@ -377,7 +990,7 @@ class PokedexApp:
         self.prev_button = ctk.CTkButton(
             master=self.nav_frame,
             text="◄",
-            command=lambda: self.show_pokemon(self.current_pokemon - 1),
+            command=lambda: self.request_pokemon(self.pending_pokemon - 1),
             width=40,
             height=30
         )
@@ -394,7 +1007,7 @@ class PokedexApp:
         self.next_button = ctk.CTkButton(
             master=self.nav_frame,
             text="►",
-            command=lambda: self.show_pokemon(self.current_pokemon + 1),
+            command=lambda: self.request_pokemon(self.pending_pokemon + 1),
             width=40,
             height=30
         )
@@ -411,6 +1024,27 @@ class PokedexApp:
         )
         self.fav_button.pack(side="left", padx=5)
         
+        # Botão de adicionar/remover da equipe
+        self.team_button = ctk.CTkButton(
+            master=self.nav_frame,
+            text="+",
+            command=self.toggle_team,
+            width=40,
+            height=30,
+            fg_color="green" if self.current_pokemon in self.team else "gray40"
+        )
+        self.team_button.pack(side="left", padx=5)
+        
+        # Botão de abrir a equipe
+        self.show_team_button = ctk.CTkButton(
+            master=self.nav_frame,
+            text="Equipe",
+            command=self.show_team,
+            width=60,
+            height=30
+        )
+        self.show_team_button.pack(side="left", padx=5)
+        
         # Botão de exportar para Excel
         self.export_button = ctk.CTkButton(
             master=self.left_panel,
@@ -461,15 +1095,141 @@ class PokedexApp:
         self.size_frame = ctk.CTkFrame(master=self.info_frame, fg_color="transparent")
         self.size_frame.pack(pady=5)
         
+        # Geração, habitat e descrição
+        self.species_label = ctk.CTkLabel(
+            master=self.info_frame,
+            font=("Roboto", 12),
+            text="",
+            wraplength=400
+        )
+        self.species_label.pack(pady=5)
+        
+        # Família de evolução
+        self.evolution_frame = ctk.CTkFrame(master=self.info_frame, fg_color="transparent")
+        self.evolution_frame.pack(pady=5)
+        
         # Cria os botões da lista de pokémons
         self.create_pokemon_list()
         
         # Atualiza a lista de histórico
         self.update_history_list()
         
+        # Atalhos de teclado para navegação
+        self.bind_navigation_keys()
+        
         # Mostra o primeiro pokémon
         self.show_pokemon(1)
 
+    def bind_navigation_keys(self):
+        """Associa as teclas de navegação da pokédex"""
+        self.main_w.bind("<Left>", lambda e: self.navigate_by_key(e, -1))
+        self.main_w.bind("<Right>", lambda e: self.navigate_by_key(e, 1))
+        self.main_w.bind("<Shift-Left>", lambda e: self.navigate_by_key(e, -JUMP_SIZE))
+        self.main_w.bind("<Shift-Right>", lambda e: self.navigate_by_key(e, JUMP_SIZE))
+        self.main_w.bind("<Prior>", lambda e: self.navigate_by_key(e, -JUMP_SIZE))  # PageUp
+        self.main_w.bind("<Next>", lambda e: self.navigate_by_key(e, JUMP_SIZE))  # PageDown
+        self.main_w.bind("<Home>", lambda e: self.navigate_by_key(e, -len(self.pk_db)))
+        self.main_w.bind("<End>", lambda e: self.navigate_by_key(e, len(self.pk_db)))
+
+    def unbind_navigation_keys(self):
+        """Remove as teclas de navegação ao sair da pokédex"""
+        for sequence in ("<Left>", "<Right>", "<Shift-Left>", "<Shift-Right>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.main_w.unbind(sequence)
+
+    def navigate_by_key(self, event, step):
+        """Navega pelo teclado (manter a tecla pressionada repete o passo)"""
+        # Nos campos de texto as setas continuam movendo o cursor
+        if isinstance(event.widget, Entry):
+            return
+        self.request_pokemon(self.pending_pokemon + step)
+
+    def clamp_pokemon_id(self, pokemon_id):
+        """Limita o ID ao intervalo de pokémons disponíveis"""
+        return max(1, min(pokemon_id, len(self.pk_db)))
+
+    def request_pokemon(self, pokemon_id):
+        """Atualiza ID e nome na hora e agrupa a renderização completa da navegação rápida"""
+        pokemon_id = self.clamp_pokemon_id(pokemon_id)
+        self.pending_pokemon = pokemon_id
+        pokemon = self.pk_db[pokemon_id]
+        
+        # Partes leves são atualizadas imediatamente
+        self.id_entry.delete(0, "end")
+        self.id_entry.insert(0, str(pokemon_id))
+        self.name_label.configure(text=f"{pokemon['name']} #{pokemon_id}")
+        self.fav_button.configure(fg_color="gold" if pokemon_id in self.favorites else "gray40")
+        self.team_button.configure(fg_color="green" if pokemon_id in self.team else "gray40")
+        
+        # Cada nova solicitação substitui a anterior; só o último pokémon é renderizado
+        if self.render_job is not None:
+            self.main_w.after_cancel(self.render_job)
+        self.render_job = self.main_w.after(RENDER_DELAY_MS, self.flush_render)
+
+    def flush_render(self):
+        """Renderiza o último pokémon solicitado pela navegação"""
+        self.render_job = None
+        self.show_pokemon(self.pending_pokemon)
+
+    def finish_pending_render(self):
+        """Renderiza já a navegação pendente, para agir sobre o pokémon que está na tela"""
+        if self.render_job is not None:
+            self.main_w.after_cancel(self.render_job)
+            self.flush_render()
+
+    def load_pokemon_image(self, pokemon_id):
+        """Exibe a imagem do pokémon, baixando-a em segundo plano se necessário"""
+        # Só a imagem do pokémon em exibição é verificada
+        self.cancel_image_poll()
+        
+        img = self.image_cache.get(pokemon_id)
+        if img is not None:
+            self.pokemon_image.configure(image=img, text="")
+            self.pokemon_image.image = img  #referência
+            return
+        
+        self.pokemon_image.configure(image="", text="Carregando...")
+        if pokemon_id not in self.image_loading:
+            self.image_loading.add(pokemon_id)
+            threading.Thread(target=self.download_pokemon_image, args=(pokemon_id,), daemon=True).start()
+        self.image_poll_job = self.main_w.after(IMAGE_POLL_MS, self.apply_pokemon_image, pokemon_id)
+
+    def cancel_image_poll(self):
+        """Cancela a verificação de imagem agendada, se houver"""
+        if self.image_poll_job is not None:
+            self.main_w.after_cancel(self.image_poll_job)
+            self.image_poll_job = None
+
+    def download_pokemon_image(self, pokemon_id):
+        """Baixa e redimensiona a imagem (executado fora da thread da interface)"""
+        try:
+            img = Image.open(urlopen(self.pk_db[pokemon_id]["sprite"], timeout=IMAGE_TIMEOUT))
+            img = img.resize((250, 250), Image.LANCZOS)  #Redimensionar com anti-aliasing
+        except Exception as e:
+            print(f"Erro ao carregar imagem: {e}")
+            img = None
+        self.image_results[pokemon_id] = img
+
+    def apply_pokemon_image(self, pokemon_id):
+        """Mostra a imagem baixada se o pokémon ainda estiver sendo exibido"""
+        self.image_poll_job = None
+        if pokemon_id != self.current_pokemon:
+            return  # O usuário já navegou para outro pokémon
+        if pokemon_id not in self.image_results:
+            self.image_poll_job = self.main_w.after(IMAGE_POLL_MS, self.apply_pokemon_image, pokemon_id)
+            return
+        
+        img = self.image_results.pop(pokemon_id)
+        self.image_loading.discard(pokemon_id)
+        if img is None:
+            self.pokemon_image.configure(text="Imagem não disponível")
+            return
+        
+        # O PhotoImage precisa ser criado na thread da interface
+        img = ImageTk.PhotoImage(img)
+        self.image_cache[pokemon_id] = img
+        self.pokemon_image.configure(image=img, text="")
+        self.pokemon_image.image = img  #referência
+
     def export_to_excel(self):
         """Exporta os dados dos pokémons para um arquivo Excel"""
         try:
@@ -571,10 +1331,13 @@ class PokedexApp:
     def show_pokemon(self, pokemon_id):
         """Exibe informações de um pokémon específico"""
         # Valida o ID
-        if pokemon_id < 1:
-            pokemon_id = 1
-        elif pokemon_id > len(self.pk_db):
-            pokemon_id = len(self.pk_db)
+        pokemon_id = self.clamp_pokemon_id(pokemon_id)
+        
+        # Cancela uma renderização agendada que ficaria desatualizada
+        if self.render_job is not None:
+            self.main_w.after_cancel(self.render_job)
+            self.render_job = None
+        self.pending_pokemon = pokemon_id
         
         # Adiciona ao histórico (se não for o mesmo Pokémon)
         if not self.history or self.history[-1] != pokemon_id:
@@ -583,6 +1346,7 @@ class PokedexApp:
             if len(self.history) > self.max_history:
                 self.history.pop(0)
             self.update_history_list()
+            self.schedule_save_config()  # Salva o histórico sem bloquear a navegação
         
         self.current_pokemon = pokemon_id
         pokemon = self.pk_db[pokemon_id]
@@ -591,17 +1355,10 @@ class PokedexApp:
         self.id_entry.delete(0, "end")
         self.id_entry.insert(0, str(pokemon_id))
         self.fav_button.configure(fg_color="gold" if pokemon_id in self.favorites else "gray40")
+        self.team_button.configure(fg_color="green" if pokemon_id in self.team else "gray40")
         
-        #imagens
-        try:
-            img = Image.open(urlopen(pokemon["sprite"]))
-            img = img.resize((250, 250), Image.LANCZOS)  #Redimensionar com anti-aliasing
-            img = ImageTk.PhotoImage(img)
-            self.pokemon_image.configure(image=img)
-            self.pokemon_image.image = img  #referência
-        except Exception as e:
-            print(f"Erro ao carregar imagem: {e}")
-            self.pokemon_image.configure(text="Imagem não disponível")
+        #imagens (carregadas em segundo plano)
+        self.load_pokemon_image(pokemon_id)
         
         # Atualiza nome e ID
         self.name_label.configure(text=f"{pokemon['name']} #{pokemon_id}")
@@ -693,8 +1450,41 @@ class PokedexApp:
             font=("Roboto", 14)
         ).pack(side="left", padx=10)
         
-        # Salva as configurações (incluindo histórico)
-        self.save_config()
+        # atualiza geração, habitat e descrição
+        species_info = []
+        if pokemon.get("generation"):
+            species_info.append(f"Geração: {pokemon['generation']}")
+        if pokemon.get("habitat"):
+            species_info.append(f"Habitat: {pokemon['habitat']}")
+        species_text = "  |  ".join(species_info)
+        if pokemon.get("flavor_text"):
+            species_text += f"\n{pokemon['flavor_text']}"
+        self.species_label.configure(text=species_text.strip())
+        
+        # atualiza a família de evolução
+        for widget in self.evolution_frame.winfo_children():
+            widget.destroy()
+        
+        if len(self.get_evolution_family(pokemon_id)) > 1:
+            for index, stage in enumerate(self.get_evolution_stages(pokemon_id)):
+                if index > 0:
+                    ctk.CTkLabel(master=self.evolution_frame, text="→", width=20).pack(side="left")
+                
+                # Evoluções alternativas do mesmo estágio ficam empilhadas
+                stage_frame = ctk.CTkFrame(master=self.evolution_frame, fg_color="transparent")
+                stage_frame.pack(side="left", padx=2)
+                for member_id in stage:
+                    ctk.CTkButton(
+                        master=stage_frame,
+                        text=self.pk_db[member_id]["name"],
+                        command=lambda id=member_id: self.show_pokemon(id),
+                        font=("Roboto", 12),
+                        fg_color="firebrick3" if member_id == pokemon_id else "gray30",
+                        hover_color="firebrick4" if member_id == pokemon_id else "gray40",
+                        width=80,
+                        height=25,
+                        corner_radius=5
+                    ).pack(pady=1)
 
     def get_type_color(self, type_name):
         """retorna a cor associada ao tipo de pokémon"""
@@ -722,6 +1512,7 @@ class PokedexApp:
 
     def toggle_favorite(self):
         """Alterna o pokémon atual como favorito"""
+        self.finish_pending_render()
         if self.current_pokemon in self.favorites:
             self.favorites.remove(self.current_pokemon)
             self.fav_button.configure(fg_color="gray40")
@@ -736,6 +1527,127 @@ class PokedexApp:
         
         self.save_config()  # Salvamento
 
+    def toggle_team(self):
+        """Adiciona ou remove o pokémon atual da equipe"""
+        self.finish_pending_render()
+        if self.current_pokemon in self.team:
+            self.team.remove(self.current_pokemon)
+            self.team_button.configure(fg_color="gray40")
+        elif len(self.team) >= MAX_TEAM_SIZE:
+            messagebox.showerror("Equipe Completa", f"A equipe já possui {MAX_TEAM_SIZE} pokémons")
+            return
+        else:
+            self.team.append(self.current_pokemon)
+        
+        self.save_config()  # Salvamento
+        self.check_team_addition(self.current_pokemon)
+
+    def add_to_team(self, pokemon_id, window):
+        """Adiciona um pokémon à equipe e reabre a janela da equipe"""
+        if pokemon_id not in self.team and len(self.team) < MAX_TEAM_SIZE:
+            self.team.append(pokemon_id)
+            self.save_config()
+            self.check_team_addition(pokemon_id)
+        window.destroy()
+        self.show_team()
+        if hasattr(self, 'team_button'):
+            self.team_button.configure(fg_color="green" if self.current_pokemon in self.team else "gray40")
+
+    def check_team_addition(self, pokemon_id):
+        """Avisa se a adição foi descartada porque outra instância completou a equipe"""
+        if hasattr(self, 'team_button'):
+            self.team_button.configure(fg_color="green" if self.current_pokemon in self.team else "gray40")
+        if pokemon_id not in self.team:
+            messagebox.showerror("Equipe Completa", f"A equipe já possui {MAX_TEAM_SIZE} pokémons")
+
+    def remove_from_team(self, pokemon_id, window):
+        """Remove um pokémon da equipe e reabre a janela da equipe"""
+        if pokemon_id in self.team:
+            self.team.remove(pokemon_id)
+            self.save_config()
+        window.destroy()
+        self.show_team()
+        if hasattr(self, 'team_button'):
+            self.team_button.configure(fg_color="green" if self.current_pokemon in self.team else "gray40")
+
+    def show_team(self):
+        """Mostra a equipe com cobertura de tipos, fraquezas e sugestão de membro"""
+        team_w = ctk.CTkToplevel(self.main_w)
+        team_w.title("Equipe")
+        team_w.geometry("450x650")
+        team_w.resizable(False, True)
+        team_w.transient(self.main_w)  # Diálogo modal
+        team_w.grab_set()
+        
+        content = ctk.CTkScrollableFrame(team_w)
+        content.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Membros da equipe
+        ctk.CTkLabel(
+            content,
+            text=f"Equipe ({len(self.team)}/{MAX_TEAM_SIZE}):",
+            font=("Roboto", 16, "bold")
+        ).pack(pady=(5, 10))
+        
+        for pokemon_id in self.team:
+            pokemon = self.pk_db[pokemon_id]
+            ctk.CTkButton(
+                content,
+                text=f"{pokemon['name']} #{pokemon_id}  ✕",
+                command=lambda id=pokemon_id: self.remove_from_team(id, team_w),
+                font=("Roboto", 12),
+                fg_color="gray30",
+                hover_color="gray40",
+                width=300,
+                height=30,
+                corner_radius=5
+            ).pack(pady=2)
+        
+        analysis = self.analyze_team()
+        
+        # Cobertura de tipos
+        coverage = mask_to_types(analysis["coverage"])
+        ctk.CTkLabel(content, text="Cobertura Ofensiva:", font=("Roboto", 14, "bold")).pack(pady=(15, 5))
+        ctk.CTkLabel(
+            content,
+            text=", ".join(coverage) if coverage else "Nenhuma",
+            wraplength=380
+        ).pack()
+        
+        # Fraquezas em comum
+        shared = mask_to_types(analysis["weak_shared"])
+        ctk.CTkLabel(content, text="Fraquezas em Comum:", font=("Roboto", 14, "bold")).pack(pady=(15, 5))
+        ctk.CTkLabel(
+            content,
+            text=", ".join(shared) if shared else "Nenhuma",
+            wraplength=380
+        ).pack()
+        
+        # Totais de atributos
+        ctk.CTkLabel(content, text="Totais de Atributos:", font=("Roboto", 14, "bold")).pack(pady=(15, 5))
+        for stat, value in analysis["stat_totals"].items():
+            ctk.CTkLabel(content, text=f"{stat}: {value}").pack()
+        ctk.CTkLabel(content, text=f"Total: {analysis['total']}", font=("Roboto", 12, "bold")).pack()
+        
+        # Sugestão de próximo membro
+        suggestion = self.suggest_team_member()
+        if suggestion is not None:
+            ctk.CTkLabel(content, text="Sugestão:", font=("Roboto", 14, "bold")).pack(pady=(15, 5))
+            ctk.CTkButton(
+                content,
+                text=f"Adicionar {self.pk_db[suggestion]['name']} #{suggestion}",
+                command=lambda: self.add_to_team(suggestion, team_w),
+                fg_color="green",
+                hover_color="darkgreen"
+            ).pack()
+        
+        # Botão de fechar
+        ctk.CTkButton(
+            team_w,
+            text="Fechar",
+            command=team_w.destroy
+        ).pack(pady=10)
+
     def search_pokemon(self, event=None):
         """Filtra a lista de pokémons baseados da busca"""
         search_term = self.search_var.get().lower()
@@ -767,6 +1679,11 @@ class PokedexApp:
 
     def return_to_main(self):
         """Volta para a tela principal"""
+        self.unbind_navigation_keys()
+        self.cancel_image_poll()
+        if self.render_job is not None:
+            self.main_w.after_cancel(self.render_job)
+            self.render_job = None
         self.pokedex_frame.pack_forget()
         self.setup_main_screen()
 